@@ -213,7 +213,7 @@ def calculate_similarity(text1, text2):
         word_sim = intersection / union if union > 0 else 0.0
 
     # Method 2: Character sequence similarity (better for small edits)
-    seq_sim = difflib.SequenceMatcher(None, text1.lower(), text2.lower()).ratio()
+    seq_sim = difflib.SequenceMatcher(None, text1.lower(), text2.lower(), autojunk=False).ratio()
 
     # Use the higher of the two similarities
     return max(word_sim, seq_sim)
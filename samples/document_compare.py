@@ -14,16 +14,20 @@ import sys
 import difflib
 import re
 import shutil
+import zipfile
 from typing import List, Tuple, Optional, Dict
 from dataclasses import dataclass
 
+from lxml import etree
+
 # Move detection settings
 MOVE_SIMILARITY_THRESHOLD = 0.85
 MIN_MOVE_WORDS = 3
 
 # Import Word support
 from docx import Document
-from docx.shared import RGBColor
+from docx.oxml import OxmlElement
+from docx.oxml.ns import qn
 
 # Import PDF support
 from pdf_support import (
@@ -31,6 +35,21 @@ from pdf_support import (
     ExtractedParagraph, extract_paragraphs_from_pdf
 )
 
+# Optional C-accelerated fuzzy matching for move detection
+try:
+    from rapidfuzz import fuzz
+    from rapidfuzz import process as _rf_process
+except ImportError:
+    fuzz = None
+    _rf_process = None
+
+# rapidfuzz's cdist builds its score matrix with numpy, which rapidfuzz
+# itself does not require; the batched path needs both installed
+try:
+    import numpy as _np
+except ImportError:
+    _np = None
+
 
 @dataclass
 class ComparisonResult:
@@ -60,6 +79,17 @@ def tokenize(text: str) -> List[str]:
     return re.findall(r'\S+|\s+', text)
 
 
+def _word_count(s: str) -> int:
+    """
+    Count whitespace-delimited words.
+
+    str.split runs as a single C-level pass; it benchmarks several times
+    faster than regex-based counting, so all stats accounting goes through
+    this one helper.
+    """
+    return len(s.split())
+
+
 def diff_texts(original_text: str, modified_text: str) -> List[Tuple[str, str]]:
     """
     Compute word-level diff between two texts.
@@ -95,25 +125,26 @@ def diff_texts(original_text: str, modified_text: str) -> List[Tuple[str, str]]:
     return result
 
 
-def calculate_similarity(text1: str, text2: str) -> float:
-    """Calculate similarity between two texts using multiple methods."""
-    if text1 == text2:
-        return 1.0
-    if not text1 or not text2:
-        return 0.0
+def _prep(text: str) -> Tuple[str, set]:
+    """
+    Prepare a text for similarity comparison: lowercase once and build the
+    word set once.
+    """
+    t = text.strip().lower()
+    return t, set(t.split())
 
-    text1 = text1.strip()
-    text2 = text2.strip()
 
-    if not text1 and not text2:
+def _sim_prepped(p1: Tuple[str, set], p2: Tuple[str, set]) -> float:
+    """Calculate similarity between two prepared texts (see _prep)."""
+    t1, words1 = p1
+    t2, words2 = p2
+
+    if t1 == t2:
         return 1.0
-    if not text1 or not text2:
+    if not t1 or not t2:
         return 0.0
 
     # Word-based Jaccard similarity
-    words1 = set(text1.lower().split())
-    words2 = set(text2.lower().split())
-
     word_sim = 0.0
     if words1 and words2:
         intersection = len(words1 & words2)
@@ -121,11 +152,16 @@ def calculate_similarity(text1: str, text2: str) -> float:
         word_sim = intersection / union if union > 0 else 0.0
 
     # Character sequence similarity
-    seq_sim = difflib.SequenceMatcher(None, text1.lower(), text2.lower()).ratio()
+    seq_sim = difflib.SequenceMatcher(None, t1, t2, autojunk=False).ratio()
 
     return max(word_sim, seq_sim)
 
 
+def calculate_similarity(text1: str, text2: str) -> float:
+    """Calculate similarity between two texts using multiple methods."""
+    return _sim_prepped(_prep(text1), _prep(text2))
+
+
 def normalize_text_for_move(text: str) -> str:
     """Normalize text for move detection comparison."""
     text = text.lower().strip()
@@ -133,41 +169,69 @@ def normalize_text_for_move(text: str) -> str:
     return text
 
 
-def detect_word_level_moves(diff_segments: List[Tuple[str, str]]) -> List[Tuple[str, str]]:
+def _match_moves(deletions: List[Tuple[int, str, Tuple[str, set]]],
+                 insertions: List[Tuple[int, str, Tuple[str, set]]]) -> Dict[int, int]:
     """
-    Detect moves within word-level diff segments.
-    Converts delete/insert pairs to move_source/move_dest when text is similar.
-    """
-    # Collect deletions and insertions
-    deletions = []  # (index, text, normalized)
-    insertions = []  # (index, text, normalized)
+    Greedily match deleted text blocks to inserted ones for move detection.
 
-    for i, (text, seg_type) in enumerate(diff_segments):
-        words = len(text.split())
-        if seg_type == 'delete' and words >= MIN_MOVE_WORDS:
-            deletions.append((i, text, normalize_text_for_move(text)))
-        elif seg_type == 'insert' and words >= MIN_MOVE_WORDS:
-            insertions.append((i, text, normalize_text_for_move(text)))
+    deletions/insertions are lists of (index, text, prepped) tuples where
+    prepped is the _prep of the normalized text. Longer deletions are matched
+    first (more confident). Returns a dict mapping deletion index to the
+    matched insertion index.
 
-    if not deletions or not insertions:
-        return diff_segments
-
-    # Find matching moves
+    Uses rapidfuzz's batched C implementation when available; falls back to
+    the pure-Python scan otherwise.
+    """
     moves = {}  # deletion_idx -> insertion_idx
-    used_insertions = set()
+    if not deletions or not insertions:
+        return moves
 
     # Sort deletions by word count descending
-    sorted_deletions = sorted(deletions, key=lambda x: len(x[1].split()), reverse=True)
+    sorted_deletions = sorted(deletions, key=lambda x: _word_count(x[1]), reverse=True)
+
+    if _rf_process is not None and _np is not None:
+        # token_set_ratio scores 100 whenever one token set contains the
+        # other, so it can't be the deciding metric - a short deletion
+        # swallowed by a long unrelated insertion is not a move. Use it
+        # only as a batched prefilter (with a generous margin below the
+        # move threshold) and confirm each surviving candidate with
+        # _sim_prepped, the same metric the fallback scan uses.
+        del_norms = [prep[0] for _, _, prep in sorted_deletions]
+        ins_norms = [prep[0] for _, _, prep in insertions]
+        scores = _rf_process.cdist(
+            del_norms, ins_norms,
+            scorer=fuzz.token_set_ratio,
+            score_cutoff=max(MOVE_SIMILARITY_THRESHOLD * 100 - 20, 0)
+        )
+
+        used_insertions = set()
+        for row, (del_idx, _, del_prep) in enumerate(sorted_deletions):
+            best_match = None
+            best_similarity = 0
+            for col in scores[row].nonzero()[0]:
+                ins_idx, _, ins_prep = insertions[col]
+                if ins_idx in used_insertions:
+                    continue
+                similarity = _sim_prepped(del_prep, ins_prep)
+                if similarity >= MOVE_SIMILARITY_THRESHOLD and similarity > best_similarity:
+                    best_similarity = similarity
+                    best_match = ins_idx
+            if best_match is not None:
+                moves[del_idx] = best_match
+                used_insertions.add(best_match)
+        return moves
+
+    used_insertions = set()
 
-    for del_idx, del_text, del_norm in sorted_deletions:
+    for del_idx, del_text, del_prep in sorted_deletions:
         best_match = None
         best_similarity = 0
 
-        for ins_idx, ins_text, ins_norm in insertions:
+        for ins_idx, ins_text, ins_prep in insertions:
             if ins_idx in used_insertions:
                 continue
 
-            similarity = calculate_similarity(del_norm, ins_norm)
+            similarity = _sim_prepped(del_prep, ins_prep)
 
             if similarity >= MOVE_SIMILARITY_THRESHOLD and similarity > best_similarity:
                 best_similarity = similarity
@@ -177,9 +241,36 @@ def detect_word_level_moves(diff_segments: List[Tuple[str, str]]) -> List[Tuple[
             moves[del_idx] = best_match
             used_insertions.add(best_match)
 
+    return moves
+
+
+def detect_word_level_moves(diff_segments: List[Tuple[str, str]]) -> List[Tuple[str, str]]:
+    """
+    Detect moves within word-level diff segments.
+    Converts delete/insert pairs to move_source/move_dest when text is similar.
+    """
+    # Collect deletions and insertions
+    deletions = []  # (index, text, normalized)
+    insertions = []  # (index, text, normalized)
+
+    for i, (text, seg_type) in enumerate(diff_segments):
+        words = _word_count(text)
+        if seg_type == 'delete' and words >= MIN_MOVE_WORDS:
+            deletions.append((i, text, _prep(normalize_text_for_move(text))))
+        elif seg_type == 'insert' and words >= MIN_MOVE_WORDS:
+            insertions.append((i, text, _prep(normalize_text_for_move(text))))
+
+    if not deletions or not insertions:
+        return diff_segments
+
+    # Find matching moves
+    moves = _match_moves(deletions, insertions)
+
     if not moves:
         return diff_segments
 
+    used_insertions = set(moves.values())
+
     # Create new segments with move markers
     result = []
     for i, (text, seg_type) in enumerate(diff_segments):
@@ -193,16 +284,112 @@ def detect_word_level_moves(diff_segments: List[Tuple[str, str]]) -> List[Tuple[
     return result
 
 
-def align_paragraphs(orig_texts: List[str], mod_texts: List[str]) -> List[Tuple[int, int, str]]:
-    """Align paragraphs using LCS algorithm."""
-    m, n = len(orig_texts), len(mod_texts)
+# Above this many LCS cells, switch from the full table to Hirschberg's
+# divide-and-conquer variant (O(min(m,n)) memory instead of O(m*n))
+HIRSCHBERG_CELL_THRESHOLD = 1_000_000
+
+
+def _lcs_lengths(prepped_a: list, prepped_b: list, threshold: float) -> List[int]:
+    """Compute the last row of the LCS length table using two rolling rows."""
+    n = len(prepped_b)
+    prev = [0] * (n + 1)
+    curr = [0] * (n + 1)
+
+    for pa in prepped_a:
+        for j in range(1, n + 1):
+            if _sim_prepped(pa, prepped_b[j-1]) >= threshold:
+                curr[j] = prev[j-1] + 1
+            else:
+                curr[j] = max(prev[j], curr[j-1])
+        prev, curr = curr, prev
+
+    return prev
+
+
+def _hirschberg_pairs(prepped_o: list, prepped_m: list, threshold: float) -> List[Tuple[int, int]]:
+    """
+    Find LCS matched (orig_idx, mod_idx) pairs with Hirschberg's algorithm.
+
+    Splits the original sequence in half, computes forward LCS lengths for
+    the top half and reverse lengths for the bottom half, picks the optimal
+    split column, then recurses. Memory stays O(min(m,n)) while time remains
+    O(m*n).
+    """
+    pairs = []
+
+    def recurse(o_lo, o_hi, m_lo, m_hi):
+        if o_hi - o_lo == 0 or m_hi - m_lo == 0:
+            return
+
+        if o_hi - o_lo == 1:
+            # Base case: single original row - scan for the first match
+            pa = prepped_o[o_lo]
+            for j in range(m_lo, m_hi):
+                if _sim_prepped(pa, prepped_m[j]) >= threshold:
+                    pairs.append((o_lo, j))
+                    return
+            return
+
+        mid = (o_lo + o_hi) // 2
+        fwd = _lcs_lengths(prepped_o[o_lo:mid], prepped_m[m_lo:m_hi], threshold)
+        rev = _lcs_lengths(prepped_o[mid:o_hi][::-1], prepped_m[m_lo:m_hi][::-1], threshold)
+
+        n = m_hi - m_lo
+        best_k = 0
+        best = -1
+        for k in range(n + 1):
+            v = fwd[k] + rev[n - k]
+            if v > best:
+                best = v
+                best_k = k
+
+        recurse(o_lo, mid, m_lo, m_lo + best_k)
+        recurse(mid, o_hi, m_lo + best_k, m_hi)
+
+    recurse(0, len(prepped_o), 0, len(prepped_m))
+    return pairs
+
+
+def _pairs_to_alignments(pairs: List[Tuple[int, int]], m: int, n: int) -> List[Tuple[int, int, str]]:
+    """Expand matched index pairs into the full match/insert/delete alignment list."""
+    alignments = []
+    i = j = 0
+
+    for pi, pj in pairs:
+        while i < pi:
+            alignments.append((i, -1, 'delete'))
+            i += 1
+        while j < pj:
+            alignments.append((-1, j, 'insert'))
+            j += 1
+        alignments.append((pi, pj, 'match'))
+        i, j = pi + 1, pj + 1
+
+    while i < m:
+        alignments.append((i, -1, 'delete'))
+        i += 1
+    while j < n:
+        alignments.append((-1, j, 'insert'))
+        j += 1
+
+    return alignments
+
+
+def _align_prepped(prepped_o: list, prepped_m: list, threshold: float = 0.4) -> List[Tuple[int, int, str]]:
+    """Align two lists of prepared texts using LCS (see _prep)."""
+    m, n = len(prepped_o), len(prepped_m)
+
+    if m * n > HIRSCHBERG_CELL_THRESHOLD:
+        # Large alignment - avoid materializing the full (m+1)x(n+1) table
+        pairs = _hirschberg_pairs(prepped_o, prepped_m, threshold)
+        return _pairs_to_alignments(pairs, m, n)
 
     # Build LCS table
     lcs = [[0] * (n + 1) for _ in range(m + 1)]
 
     for i in range(1, m + 1):
         for j in range(1, n + 1):
-            if calculate_similarity(orig_texts[i-1], mod_texts[j-1]) >= 0.4:
+            if _sim_prepped(prepped_o[i-1], prepped_m[j-1]) >= threshold:
                 lcs[i][j] = lcs[i-1][j-1] + 1
             else:
                 lcs[i][j] = max(lcs[i-1][j], lcs[i][j-1])
@@ -213,7 +400,7 @@ def align_paragraphs(orig_texts: List[str], mod_texts: List[str]) -> List[Tuple[
 
     while i > 0 or j > 0:
         if i > 0 and j > 0:
-            if calculate_similarity(orig_texts[i-1], mod_texts[j-1]) >= 0.4:
+            if _sim_prepped(prepped_o[i-1], prepped_m[j-1]) >= threshold:
                 alignments.append((i-1, j-1, 'match'))
                 i -= 1
                 j -= 1
@@ -230,16 +417,70 @@ def align_paragraphs(orig_texts: List[str], mod_texts: List[str]) -> List[Tuple[
     return alignments
 
 
+def align_paragraphs(orig_texts: List[str], mod_texts: List[str]) -> List[Tuple[int, int, str]]:
+    """Align paragraphs using LCS algorithm."""
+    # Prepare each text once instead of per LCS cell
+    prepped_o = [_prep(t) for t in orig_texts]
+    prepped_m = [_prep(t) for t in mod_texts]
+
+    return _align_prepped(prepped_o, prepped_m)
+
+
+# WordprocessingML namespace for direct XML access
+_W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+
+
+def _read_body_xml(doc_path: str):
+    """Read and parse word/document.xml from a .docx package, returning the body element."""
+    with zipfile.ZipFile(doc_path) as zf:
+        root = etree.fromstring(zf.read('word/document.xml'))
+    return root.find(_W + 'body')
+
+
+def _paragraph_xml_text(p_element) -> str:
+    """Join all w:t text of a paragraph element."""
+    return ''.join(t.text or '' for t in p_element.iter(_W + 't'))
+
+
+def _paragraph_xml_is_heading(p_element) -> bool:
+    """Check for a Heading paragraph style directly on the w:pStyle element."""
+    style = p_element.find(_W + 'pPr/' + _W + 'pStyle')
+    if style is None:
+        return False
+    val = style.get(_W + 'val')
+    return val is not None and val.startswith('Heading')
+
+
 def extract_paragraphs_from_word(doc_path: str) -> List[Tuple[str, dict]]:
     """Extract paragraphs from Word document with metadata."""
+    try:
+        body = _read_body_xml(doc_path)
+        return [(_paragraph_xml_text(p), {'is_heading': _paragraph_xml_is_heading(p)})
+                for p in body.iterchildren(_W + 'p')]
+    except (KeyError, zipfile.BadZipFile, etree.XMLSyntaxError):
+        # Unusual package layout - fall back to the python-docx object model
+        return _extract_paragraphs_from_word_docx(doc_path)
+
+
+def _docx_paragraph_is_heading(para) -> bool:
+    """
+    Heading check on the raw w:pStyle element of a python-docx paragraph.
+
+    Avoids para.style, which materializes a full Style wrapper object via
+    XML traversal for every paragraph.
+    """
+    pPr = para._p.pPr
+    if pPr is None or pPr.pStyle is None:
+        return False
+    val = pPr.pStyle.val
+    return val is not None and val.startswith('Heading')
+
+
+def _extract_paragraphs_from_word_docx(doc_path: str) -> List[Tuple[str, dict]]:
+    """python-docx fallback for extract_paragraphs_from_word."""
     doc = Document(doc_path)
-    result = []
-    for para in doc.paragraphs:
-        metadata = {
-            'is_heading': para.style.name.startswith('Heading') if para.style else False
-        }
-        result.append((para.text, metadata))
-    return result
+    return [(para.text, {'is_heading': _docx_paragraph_is_heading(para)})
+            for para in doc.paragraphs]
 
 
 def extract_tables_from_word(doc_path: str) -> List[List[List[str]]]:
@@ -247,6 +488,26 @@ def extract_tables_from_word(doc_path: str) -> List[List[List[str]]]:
     Extract tables from Word document.
     Returns list of tables, each table is a list of rows, each row is a list of cell texts.
     """
+    try:
+        body = _read_body_xml(doc_path)
+        tables = []
+        for tbl in body.iterchildren(_W + 'tbl'):
+            table_data = []
+            for row in tbl.findall(_W + 'tr'):
+                row_data = []
+                for cell in row.findall(_W + 'tc'):
+                    cell_text = '\n'.join(_paragraph_xml_text(p)
+                                          for p in cell.findall(_W + 'p'))
+                    row_data.append(cell_text)
+                table_data.append(row_data)
+            tables.append(table_data)
+        return tables
+    except (KeyError, zipfile.BadZipFile, etree.XMLSyntaxError):
+        return _extract_tables_from_word_docx(doc_path)
+
+
+def _extract_tables_from_word_docx(doc_path: str) -> List[List[List[str]]]:
+    """python-docx fallback for extract_tables_from_word."""
     doc = Document(doc_path)
     tables = []
     for table in doc.tables:
@@ -275,47 +536,40 @@ def extract_tables_from_document(doc_path: str) -> List[List[List[str]]]:
 
 def compare_table_rows(orig_rows: List[List[str]], mod_rows: List[List[str]]) -> List[Tuple[int, int, str]]:
     """Align rows between two tables using LCS algorithm."""
-    m, n = len(orig_rows), len(mod_rows)
-
     def get_row_text(row):
         return ' | '.join(row)
 
-    # Build LCS table
-    lcs = [[0] * (n + 1) for _ in range(m + 1)]
+    # Prepare each row's combined text once instead of per LCS cell
+    prepped_o = [_prep(get_row_text(row)) for row in orig_rows]
+    prepped_m = [_prep(get_row_text(row)) for row in mod_rows]
 
-    for i in range(1, m + 1):
-        for j in range(1, n + 1):
-            orig_text = get_row_text(orig_rows[i-1])
-            mod_text = get_row_text(mod_rows[j-1])
+    return _align_prepped(prepped_o, prepped_m)
 
-            if calculate_similarity(orig_text, mod_text) >= 0.4:
-                lcs[i][j] = lcs[i-1][j-1] + 1
-            else:
-                lcs[i][j] = max(lcs[i-1][j], lcs[i][j-1])
 
-    # Backtrack
-    alignments = []
-    i, j = m, n
+def _diff_and_moves(pair: Tuple[str, str]) -> List[Tuple[str, str]]:
+    """Word-level diff plus move detection for one (original, modified) text pair."""
+    orig_text, mod_text = pair
+    return detect_word_level_moves(diff_texts(orig_text, mod_text))
 
-    while i > 0 or j > 0:
-        if i > 0 and j > 0:
-            orig_text = get_row_text(orig_rows[i-1])
-            mod_text = get_row_text(mod_rows[j-1])
-            if calculate_similarity(orig_text, mod_text) >= 0.4:
-                alignments.append((i-1, j-1, 'match'))
-                i -= 1
-                j -= 1
-                continue
 
-        if j > 0 and (i == 0 or lcs[i][j-1] >= lcs[i-1][j]):
-            alignments.append((-1, j-1, 'insert'))
-            j -= 1
-        else:
-            alignments.append((i-1, -1, 'delete'))
-            i -= 1
+# Below this many pairs, process startup and pickling outweigh the win
+# of parallel diffing - run serially instead
+PARALLEL_DIFF_MIN_PAIRS = 50
 
-    alignments.reverse()
-    return alignments
+
+def _diff_pairs_batch(pairs: List[Tuple[str, str]]) -> List[List[Tuple[str, str]]]:
+    """
+    Diff many (original, modified) text pairs, preserving order.
+
+    The per-pair work (SequenceMatcher + move detection) is CPU-bound and
+    independent, so large batches are fanned out to a process pool.
+    """
+    if len(pairs) < PARALLEL_DIFF_MIN_PAIRS:
+        return [_diff_and_moves(p) for p in pairs]
+
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor() as executor:
+        return list(executor.map(_diff_and_moves, pairs, chunksize=32))
 
 
 def diff_table(orig_table: List[List[str]], mod_table: List[List[str]], stats: dict) -> List[dict]:
@@ -325,6 +579,18 @@ def diff_table(orig_table: List[List[str]], mod_table: List[List[str]], stats: d
     results = []
     row_alignments = compare_table_rows(orig_table, mod_table)
 
+    # First pass: collect the changed cell pairs so they can be diffed as one batch
+    cell_pairs = []
+    for orig_row_idx, mod_row_idx, align_type in row_alignments:
+        if align_type == 'match' and orig_row_idx >= 0 and mod_row_idx >= 0:
+            orig_row = orig_table[orig_row_idx]
+            mod_row = mod_table[mod_row_idx]
+            for col_idx in range(min(len(orig_row), len(mod_row))):
+                if orig_row[col_idx].strip() != mod_row[col_idx].strip():
+                    cell_pairs.append((orig_row[col_idx], mod_row[col_idx]))
+
+    cell_diffs = iter(_diff_pairs_batch(cell_pairs))
+
     for orig_row_idx, mod_row_idx, align_type in row_alignments:
         if align_type == 'match' and orig_row_idx >= 0 and mod_row_idx >= 0:
             orig_row = orig_table[orig_row_idx]
@@ -340,12 +606,11 @@ def diff_table(orig_table: List[List[str]], mod_table: List[List[str]], stats: d
                     mod_cell = mod_row[col_idx]
 
                     if orig_cell.strip() != mod_cell.strip():
-                        # Cell changed - compute diff
-                        cell_diff = diff_texts(orig_cell, mod_cell)
-                        cell_diff = detect_word_level_moves(cell_diff)
+                        # Cell changed - take the precomputed diff
+                        cell_diff = next(cell_diffs)
 
                         for text, seg_type in cell_diff:
-                            words = len(text.split())
+                            words = _word_count(text)
                             if seg_type == 'insert':
                                 stats['insertions'] += words
                             elif seg_type == 'delete':
@@ -358,7 +623,7 @@ def diff_table(orig_table: List[List[str]], mod_table: List[List[str]], stats: d
                         row_segments.extend(cell_diff)
                     else:
                         row_segments.append((mod_cell, 'equal'))
-                        stats['unchanged'] += len(mod_cell.split())
+                        stats['unchanged'] += _word_count(mod_cell)
 
                     # Add cell separator
                     if col_idx < max_cols - 1:
@@ -367,7 +632,7 @@ def diff_table(orig_table: List[List[str]], mod_table: List[List[str]], stats: d
                 elif col_idx < len(mod_row):
                     # New column
                     row_segments.append((mod_row[col_idx], 'insert'))
-                    stats['insertions'] += len(mod_row[col_idx].split())
+                    stats['insertions'] += _word_count(mod_row[col_idx])
                     if col_idx < max_cols - 1:
                         row_segments.append((' | ', 'equal'))
 
@@ -378,14 +643,14 @@ def diff_table(orig_table: List[List[str]], mod_table: List[List[str]], stats: d
             mod_row = mod_table[mod_row_idx]
             row_text = ' | '.join(mod_row)
             results.append({'segments': [(row_text, 'insert')], 'is_heading': False, 'is_table_row': True})
-            stats['insertions'] += len(row_text.split())
+            stats['insertions'] += _word_count(row_text)
 
         elif align_type == 'delete' and orig_row_idx >= 0:
             # Deleted row
             orig_row = orig_table[orig_row_idx]
             row_text = ' | '.join(orig_row)
             results.append({'segments': [(row_text, 'delete')], 'is_heading': False, 'is_table_row': True})
-            stats['deletions'] += len(row_text.split())
+            stats['deletions'] += _word_count(row_text)
 
     return results
 
@@ -459,6 +724,14 @@ def compare_documents(
         diff_results = []
         stats = {'insertions': 0, 'deletions': 0, 'moves': 0, 'unchanged': 0}
 
+        # Batch-diff the matched pairs whose text actually differs; large
+        # batches are diffed in parallel (see _diff_pairs_batch)
+        changed_pairs = [(orig_texts[orig_idx], mod_texts[mod_idx])
+                         for orig_idx, mod_idx, align_type in alignments
+                         if align_type == 'match'
+                         and orig_texts[orig_idx].strip() != mod_texts[mod_idx].strip()]
+        changed_diffs = iter(_diff_pairs_batch(changed_pairs))
+
         # First pass: collect all diffs
         temp_results = []
         for orig_idx, mod_idx, align_type in alignments:
@@ -468,9 +741,7 @@ def compare_documents(
                 mod_meta = mod_paras[mod_idx][1]
 
                 if orig_text.strip() != mod_text.strip():
-                    segments = diff_texts(orig_text, mod_text)
-                    # Apply word-level move detection
-                    segments = detect_word_level_moves(segments)
+                    segments = next(changed_diffs)
                 else:
                     segments = [(mod_text, 'equal')]
 
@@ -504,30 +775,17 @@ def compare_documents(
 
         # Second pass: detect paragraph-level moves
         deletions = [(i, r['text']) for i, r in enumerate(temp_results)
-                     if r.get('align_type') == 'delete' and len(r.get('text', '').split()) >= MIN_MOVE_WORDS]
+                     if r.get('align_type') == 'delete' and _word_count(r.get('text', '')) >= MIN_MOVE_WORDS]
         insertions = [(i, r['text']) for i, r in enumerate(temp_results)
-                      if r.get('align_type') == 'insert' and len(r.get('text', '').split()) >= MIN_MOVE_WORDS]
-
-        para_moves = {}  # del_idx -> ins_idx
-        used_insertions = set()
-
-        for del_idx, del_text in sorted(deletions, key=lambda x: len(x[1].split()), reverse=True):
-            del_norm = normalize_text_for_move(del_text)
-            best_match = None
-            best_sim = 0
+                      if r.get('align_type') == 'insert' and _word_count(r.get('text', '')) >= MIN_MOVE_WORDS]
 
-            for ins_idx, ins_text in insertions:
-                if ins_idx in used_insertions:
-                    continue
-                ins_norm = normalize_text_for_move(ins_text)
-                sim = calculate_similarity(del_norm, ins_norm)
-                if sim >= MOVE_SIMILARITY_THRESHOLD and sim > best_sim:
-                    best_sim = sim
-                    best_match = ins_idx
+        del_candidates = [(i, text, _prep(normalize_text_for_move(text)))
+                          for i, text in deletions]
+        ins_candidates = [(i, text, _prep(normalize_text_for_move(text)))
+                          for i, text in insertions]
 
-            if best_match is not None:
-                para_moves[del_idx] = best_match
-                used_insertions.add(best_match)
+        para_moves = _match_moves(del_candidates, ins_candidates)  # del_idx -> ins_idx
+        used_insertions = set(para_moves.values())
 
         # Apply paragraph-level moves and build final results
         for i, result in enumerate(temp_results):
@@ -540,7 +798,7 @@ def compare_documents(
 
             # Count stats
             for text, seg_type in result['segments']:
-                words = len(text.split())
+                words = _word_count(text)
                 if seg_type == 'insert':
                     stats['insertions'] += words
                 elif seg_type == 'delete':
@@ -576,7 +834,7 @@ def compare_documents(
                             'is_heading': False,
                             'is_table_row': True
                         })
-                        stats['insertions'] += len(row_text.split())
+                        stats['insertions'] += _word_count(row_text)
                 elif t_idx < len(orig_tables):
                     # Deleted table - mark all as deleted
                     print(f"  Table {t_idx + 1} was deleted...")
@@ -587,7 +845,7 @@ def compare_documents(
                             'is_heading': False,
                             'is_table_row': True
                         })
-                        stats['deletions'] += len(row_text.split())
+                        stats['deletions'] += _word_count(row_text)
 
         # Generate output
         print(f"Generating {output_format} output...")
@@ -628,6 +886,42 @@ def generate_pdf_redline(diff_results: List[dict], output_path: str):
     generator.generate_redline(diff_results)
 
 
+# Run properties per segment type, as (element tag, w:val) pairs in schema order
+_REDLINE_RUN_PROPS = {
+    'delete': (('w:strike', None), ('w:color', 'FF0000')),       # Red strikethrough
+    'insert': (('w:b', None), ('w:color', '0000FF')),            # Blue bold
+    'move_source': (('w:strike', None), ('w:color', '008000')),  # Green strikethrough
+    'move_dest': (('w:color', '008000'),),                       # Green
+}
+
+
+def _append_redline_run(p_element, text: str, seg_type: str):
+    """
+    Append a single formatted <w:r> to a paragraph element.
+
+    Builds the run XML directly instead of going through para.add_run plus
+    per-attribute Font/ColorFormat descriptors, which each mutate the XML
+    separately.
+    """
+    r = OxmlElement('w:r')
+
+    props = _REDLINE_RUN_PROPS.get(seg_type)
+    if props:
+        rPr = OxmlElement('w:rPr')
+        for tag, val in props:
+            el = OxmlElement(tag)
+            if val is not None:
+                el.set(qn('w:val'), val)
+            rPr.append(el)
+        r.append(rPr)
+
+    t = OxmlElement('w:t')
+    t.set(qn('xml:space'), 'preserve')
+    t.text = text
+    r.append(t)
+    p_element.append(r)
+
+
 def generate_word_redline(diff_results: List[dict], output_path: str, base_doc_path: Optional[str] = None):
     """Generate a redlined Word document."""
     doc = Document()
@@ -644,23 +938,12 @@ def generate_word_redline(diff_results: List[dict], output_path: str, base_doc_p
         else:
             para = doc.add_paragraph()
 
+        p_element = para._p
         for text, seg_type in segments:
             if not text:
                 continue
 
-            run = para.add_run(text)
-
-            if seg_type == 'delete':
-                run.font.strike = True
-                run.font.color.rgb = RGBColor(255, 0, 0)  # Red
-            elif seg_type == 'insert':
-                run.bold = True
-                run.font.color.rgb = RGBColor(0, 0, 255)  # Blue
-            elif seg_type == 'move_source':
-                run.font.strike = True
-                run.font.color.rgb = RGBColor(0, 128, 0)  # Green
-            elif seg_type == 'move_dest':
-                run.font.color.rgb = RGBColor(0, 128, 0)  # Green
+            _append_redline_run(p_element, text, seg_type)
 
     doc.save(output_path)
 
@@ -4,14 +4,20 @@ import os
 import sys
 import subprocess
 import platform
+from pathlib import Path
 import tkinter as tk
 from tkinter import filedialog, messagebox
 from tkinter import ttk
-import threading
+import queue
+from concurrent.futures import ThreadPoolExecutor
 
 # Import the comparison function directly
 from compare_preserve_formatting import compare_with_full_formatting
 
+# Shared worker pool: reused across comparisons instead of spawning a
+# fresh thread per click.
+_EXECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix="compare")
+
 
 class DocumentCompareGUI:
     def __init__(self, root):
@@ -24,6 +30,10 @@ class DocumentCompareGUI:
         self.original_path = tk.StringVar()
         self.modified_path = tk.StringVar()
 
+        # Worker -> main-thread handoff. Tk is not thread-safe, so the
+        # worker only ever puts results here; the main thread polls.
+        self._result_q = queue.Queue()
+
         self.create_widgets()
 
     def create_widgets(self):
@@ -80,40 +90,53 @@ class DocumentCompareGUI:
             messagebox.showerror("Error", "Please select both documents")
             return
 
-        if not os.path.exists(original):
-            messagebox.showerror("Error", f"Original file not found:\n{original}")
-            return
-
-        if not os.path.exists(modified):
-            messagebox.showerror("Error", f"Modified file not found:\n{modified}")
-            return
+        # Missing files surface as FileNotFoundError from the worker and
+        # land in handle_error; checking up front would just race the
+        # actual open anyway.
 
-        # Generate output path
-        modified_dir = os.path.dirname(modified)
-        modified_name = os.path.splitext(os.path.basename(modified))[0]
-        output_path = os.path.join(modified_dir, f"{modified_name}_REDLINE.docx")
+        # Generate output path next to the modified file
+        modified_p = Path(modified)
+        output_path = str(modified_p.with_name(f"{modified_p.stem}_REDLINE.docx"))
 
         # Update UI
         self.compare_btn.config(state="disabled")
         self.status_var.set("Comparing documents...")
         self.status_label.config(foreground="blue")
-        self.root.update()
+        # update_idletasks flushes the pending redraw without re-entering the
+        # event loop, so a re-click can't fire while we're mid-dispatch
+        self.root.update_idletasks()
 
         # Store output path for use in callbacks
         self.output_path = output_path
 
-        # Run comparison in a thread to keep UI responsive
-        thread = threading.Thread(target=self.run_comparison, args=(original, modified, output_path))
-        thread.start()
+        # Run comparison off the main thread to keep the UI responsive
+        _EXECUTOR.submit(self.run_comparison, original, modified, output_path)
+        self.root.after(100, self._poll)
 
     def run_comparison(self, original, modified, output_path):
-        """Run the comparison in a background thread."""
+        """Run the comparison in a background thread.
+
+        This runs off the main thread, so it must not touch any Tk object
+        (not even root.after); it just reports through the queue.
+        """
         try:
             compare_with_full_formatting(original, modified, output_path)
-            # Schedule UI update on main thread
-            self.root.after(0, lambda: self.finish_comparison(output_path))
+            self._result_q.put(('done', output_path))
         except Exception as e:
-            self.root.after(0, lambda: self.handle_error(str(e)))
+            self._result_q.put(('err', str(e)))
+
+    def _poll(self):
+        """Check for a worker result on the main thread."""
+        try:
+            kind, payload = self._result_q.get_nowait()
+        except queue.Empty:
+            self.root.after(100, self._poll)
+            return
+
+        if kind == 'done':
+            self.finish_comparison(payload)
+        else:
+            self.handle_error(payload)
 
     def finish_comparison(self, output_path):
         """Open output file and close the app."""
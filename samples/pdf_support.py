@@ -7,17 +7,17 @@ Provides:
 3. Integration with Word comparison
 """
 
-import fitz  # PyMuPDF
+import io
 import os
 import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from typing import List, Optional, Tuple
-from reportlab.lib.pagesizes import letter
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.colors import red, blue, black, green
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
-from reportlab.lib.units import inch
-from reportlab.lib.enums import TA_LEFT, TA_CENTER, TA_RIGHT
+
+# fitz (PyMuPDF) and reportlab are imported lazily inside the classes that
+# need them: together they cost a few hundred ms and tens of MB at import
+# time, which .docx-only comparisons shouldn't pay.
 
 
 @dataclass
@@ -34,9 +34,19 @@ class ExtractedParagraph:
 class PdfParser:
     """Extracts text and structure from PDF documents."""
 
+    # Below this many pages, thread startup outweighs the parallel win
+    PARALLEL_PAGE_MIN = 8
+
     def __init__(self, filepath: str):
+        import fitz  # PyMuPDF
+
+        self._fitz = fitz
         self.filepath = filepath
         self.doc = fitz.open(filepath)
+        # Font names repeat heavily across a document; cache the
+        # "is this font bold" answer per raw name so repeated spans skip
+        # the lower() allocation and substring scan.
+        self._bold_cache = {}
 
     def close(self):
         self.doc.close()
@@ -47,49 +57,138 @@ class PdfParser:
     def __exit__(self, exc_type, exc_val, exc_tb):
         self.close()
 
-    def extract_paragraphs(self) -> List[ExtractedParagraph]:
-        """Extract paragraphs from the PDF with basic structure detection."""
-        paragraphs = []
+    def iter_paragraphs(self, *, detailed: bool = True):
+        """
+        Stream paragraphs one page at a time.
 
+        Yields the same ExtractedParagraph objects as extract_paragraphs, but
+        only one page's layout dict is alive at any moment, capping peak
+        memory on very large PDFs.
+        """
+        extract = self._extract_page if detailed else self._extract_page_fast
         for page_num in range(len(self.doc)):
-            page = self.doc[page_num]
-            blocks = page.get_text("dict")["blocks"]
+            yield from extract(self.doc[page_num], page_num)
+
+    def extract_paragraphs(self, *, detailed: bool = True) -> List[ExtractedParagraph]:
+        """Extract paragraphs from the PDF with basic structure detection.
+
+        With detailed=False the span-level pass is skipped entirely:
+        MuPDF's much cheaper "blocks" representation supplies text and
+        bboxes only, and is_bold/is_heading come back False. Use it when
+        the caller only needs the text.
+        """
+        page_count = len(self.doc)
+        extract = self._extract_page if detailed else self._extract_page_fast
+
+        if page_count < self.PARALLEL_PAGE_MIN:
+            return list(self.iter_paragraphs(detailed=detailed))
+
+        # MuPDF releases the GIL inside get_text, so pages parse in parallel.
+        # A Document handle is not safely shareable across threads, so each
+        # worker thread opens its own.
+        local = threading.local()
+
+        def extract_one(page_num):
+            doc = getattr(local, 'doc', None)
+            if doc is None:
+                doc = local.doc = self._fitz.open(self.filepath)
+            return extract(doc[page_num], page_num)
+
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            per_page = list(executor.map(extract_one, range(page_count)))
 
+        return [para for page_paras in per_page for para in page_paras]
+
+    def _extract_page(self, page, page_num: int, textpage=None) -> List[ExtractedParagraph]:
+        """Extract the paragraphs of a single page.
+
+        An already-built TextPage can be passed in to skip MuPDF's layout
+        pass — the most expensive step in this module — when the page has
+        been analyzed once already (e.g. text then structure extraction).
+        """
+        paragraphs = []
+        _append = paragraphs.append  # hoisted out of the span loop
+
+        if textpage is None:
+            textpage = page.get_textpage()
+        blocks = page.get_text("dict", textpage=textpage)["blocks"]
+
+        # Text blocks always carry "lines"/"spans"/"text" in PyMuPDF, so
+        # index the keys directly instead of .get() with a fresh default
+        # list per lookup; the page-level KeyError net below covers a
+        # malformed layout dict.
+        try:
             for block in blocks:
-                if block["type"] == 0:  # Text block
-                    block_text = []
-                    max_font_size = 0
-                    is_bold = False
-
-                    for line in block.get("lines", []):
-                        line_text = []
-                        for span in line.get("spans", []):
-                            text = span.get("text", "")
-                            if text.strip():
-                                line_text.append(text)
-                                font_size = span.get("size", 12)
-                                max_font_size = max(max_font_size, font_size)
-                                # Check for bold font
-                                font_name = span.get("font", "").lower()
-                                if "bold" in font_name:
-                                    is_bold = True
-
-                        if line_text:
-                            block_text.append(" ".join(line_text))
-
-                    if block_text:
-                        full_text = " ".join(block_text)
-                        # Detect headings based on font size
-                        is_heading = max_font_size > 14
-
-                        paragraphs.append(ExtractedParagraph(
-                            text=full_text,
-                            page_num=page_num + 1,
-                            bbox=block.get("bbox"),
-                            font_size=max_font_size,
-                            is_bold=is_bold,
-                            is_heading=is_heading
-                        ))
+                if block["type"] != 0:  # Not a text block
+                    continue
+
+                block_text = []
+                max_font_size = 0
+                is_bold = False
+
+                for line in block["lines"]:
+                    line_text = []
+                    for span in line["spans"]:
+                        text = span["text"]
+                        if text.strip():
+                            line_text.append(text)
+                            font_size = span.get("size", 12)
+                            if font_size > max_font_size:
+                                max_font_size = font_size
+                            # Check for bold font
+                            font_name = span.get("font", "")
+                            bold = self._bold_cache.get(font_name)
+                            if bold is None:
+                                bold = "bold" in font_name.lower()
+                                self._bold_cache[font_name] = bold
+                            if bold:
+                                is_bold = True
+
+                    if line_text:
+                        block_text.append(" ".join(line_text))
+
+                if block_text:
+                    full_text = " ".join(block_text)
+                    # Detect headings based on font size
+                    is_heading = max_font_size > 14
+
+                    _append(ExtractedParagraph(
+                        text=full_text,
+                        page_num=page_num + 1,
+                        bbox=block.get("bbox"),
+                        font_size=max_font_size,
+                        is_bold=is_bold,
+                        is_heading=is_heading
+                    ))
+        except KeyError:
+            # Keep whatever parsed cleanly from this page
+            pass
+
+        return paragraphs
+
+    def _extract_page_fast(self, page, page_num: int, textpage=None) -> List[ExtractedParagraph]:
+        """Extract a page's paragraphs without font/style detection.
+
+        get_text("blocks") skips MuPDF's per-span font tracking, so this is
+        typically 2-3x faster than the "dict" walk in _extract_page. As in
+        _extract_page, a prebuilt TextPage can be reused.
+        """
+        paragraphs = []
+
+        if textpage is None:
+            textpage = page.get_textpage()
+
+        # Each block is (x0, y0, x1, y1, text, block_no, type)
+        for x0, y0, x1, y1, text, _block_no, block_type in page.get_text("blocks", textpage=textpage):
+            if block_type != 0:  # Not a text block
+                continue
+            full_text = " ".join(text.split())
+            if full_text:
+                paragraphs.append(ExtractedParagraph(
+                    text=full_text,
+                    page_num=page_num + 1,
+                    bbox=(x0, y0, x1, y1)
+                ))
 
         return paragraphs
 
@@ -104,16 +203,43 @@ class PdfParser:
         return len(self.doc)
 
 
+# ReportLab markup wrapped around each diff segment, keyed by segment type.
+# Looked up once per segment instead of walking an if/elif chain and
+# re-parsing an f-string template.
+_SEG_WRAP = {
+    'delete': ('<font color="red"><strike>', '</strike></font>'),        # Red strikethrough
+    'insert': ('<font color="blue"><b>', '</b></font>'),                 # Blue bold
+    'move_source': ('<font color="green"><strike>', '</strike></font>'),  # Moved from here
+    'move_dest': ('<font color="green">', '</font>'),                    # Moved to here
+    'equal': ('', ''),
+}
+
+
 class PdfGenerator:
     """Generates PDF documents with redline formatting."""
 
+    # Single-pass XML escaping table (one translate call instead of five
+    # sequential str.replace scans)
+    _XML_ESCAPE = str.maketrans({
+        "&": "&amp;",
+        "<": "&lt;",
+        ">": "&gt;",
+        '"': "&quot;",
+        "'": "&apos;",
+    })
+
     def __init__(self, output_path: str):
+        from reportlab.lib.styles import getSampleStyleSheet
+
         self.output_path = output_path
         self.styles = getSampleStyleSheet()
         self._setup_styles()
 
     def _setup_styles(self):
         """Set up custom styles for redline formatting."""
+        from reportlab.lib.styles import ParagraphStyle
+        from reportlab.lib.colors import red, blue
+
         # Normal text
         self.styles.add(ParagraphStyle(
             name='Normal_Custom',
@@ -160,6 +286,9 @@ class PdfGenerator:
         diff_paragraphs: List of dicts with 'segments' key containing
                         list of (text, type) tuples where type is 'equal', 'delete', or 'insert'
         """
+        from reportlab.lib.pagesizes import letter
+        from reportlab.platypus import Paragraph, SimpleDocTemplate
+
         doc = SimpleDocTemplate(
             self.output_path,
             pagesize=letter,
@@ -170,6 +299,9 @@ class PdfGenerator:
         )
 
         story = []
+        # One buffer reused for every paragraph: its capacity amortizes
+        # across the document instead of a fresh list + join per paragraph.
+        buf = io.StringIO()
 
         for para_info in diff_paragraphs:
             segments = para_info.get('segments', [])
@@ -179,49 +311,25 @@ class PdfGenerator:
                 continue
 
             # Build formatted paragraph text
-            formatted_parts = []
+            buf.seek(0)
+            buf.truncate(0)
             for text, seg_type in segments:
                 if not text:
                     continue
 
+                prefix, suffix = _SEG_WRAP.get(seg_type, ('', ''))
+                buf.write(prefix)
                 # Escape special XML characters
-                escaped_text = self._escape_xml(text)
-
-                if seg_type == 'delete':
-                    # Red strikethrough
-                    formatted_parts.append(
-                        f'<font color="red"><strike>{escaped_text}</strike></font>'
-                    )
-                elif seg_type == 'insert':
-                    # Blue bold
-                    formatted_parts.append(
-                        f'<font color="blue"><b>{escaped_text}</b></font>'
-                    )
-                elif seg_type == 'move_source':
-                    # Green strikethrough (moved from here)
-                    formatted_parts.append(
-                        f'<font color="green"><strike>{escaped_text}</strike></font>'
-                    )
-                elif seg_type == 'move_dest':
-                    # Green (moved to here)
-                    formatted_parts.append(
-                        f'<font color="green">{escaped_text}</font>'
-                    )
-                else:
-                    # Normal
-                    formatted_parts.append(escaped_text)
-
-            if formatted_parts:
-                full_text = "".join(formatted_parts)
+                buf.write(self._escape_xml(text))
+                buf.write(suffix)
+
+            full_text = buf.getvalue()
+            if full_text:
                 style = self.styles['Heading_Custom'] if is_heading else self.styles['Normal_Custom']
-                try:
-                    para = Paragraph(full_text, style)
-                    story.append(para)
-                except Exception as e:
-                    # If paragraph fails, add as plain text
-                    story.append(Paragraph(self._escape_xml(" ".join(
-                        text for text, _ in segments if text
-                    )), self.styles['Normal_Custom']))
+                # Markup is safe by construction: user text goes through
+                # _escape_xml and the only tags come from _SEG_WRAP, so
+                # Paragraph() can't fail on malformed XML.
+                story.append(Paragraph(full_text, style))
 
         if story:
             doc.build(story)
@@ -231,12 +339,89 @@ class PdfGenerator:
 
     def _escape_xml(self, text: str) -> str:
         """Escape special XML characters for ReportLab."""
-        text = text.replace("&", "&amp;")
-        text = text.replace("<", "&lt;")
-        text = text.replace(">", "&gt;")
-        text = text.replace('"', "&quot;")
-        text = text.replace("'", "&apos;")
-        return text
+        return text.translate(self._XML_ESCAPE)
+
+    def generate_redline_fast(self, diff_paragraphs: List[dict]):
+        """
+        Generate a redlined PDF by drawing straight on a canvas.
+
+        Takes the same diff_paragraphs as generate_redline but bypasses
+        Platypus entirely: no XML parsing, no Paragraph flowables, just
+        setFont/drawString with a manual cursor and page breaks.
+        Strikethrough is a line drawn across the text extent. For redlines
+        with thousands of paragraphs this is where generate_redline spends
+        most of its time.
+        """
+        from reportlab.lib.colors import black, blue, green, red
+        from reportlab.lib.pagesizes import letter
+        from reportlab.pdfbase.pdfmetrics import stringWidth
+        from reportlab.pdfgen import canvas
+
+        page_w, page_h = letter
+        margin = 72
+        max_x = page_w - margin
+        leading = 14
+
+        seg_colors = {
+            'delete': red,
+            'insert': blue,
+            'move_source': green,
+            'move_dest': green,
+        }
+        struck = ('delete', 'move_source')
+
+        c = canvas.Canvas(self.output_path, pagesize=letter)
+        x = margin
+        y = page_h - margin
+        drew_any = False
+
+        def newline(extra=0):
+            nonlocal x, y
+            x = margin
+            y -= leading + extra
+            if y < margin:
+                c.showPage()
+                y = page_h - margin
+
+        for para_info in diff_paragraphs:
+            segments = para_info.get('segments', [])
+            if not segments:
+                continue
+            is_heading = para_info.get('is_heading', False)
+            font_size = 14 if is_heading else 11
+
+            for text, seg_type in segments:
+                if not text:
+                    continue
+                bold = is_heading or seg_type == 'insert'
+                font = "Helvetica-Bold" if bold else "Helvetica"
+                color = seg_colors.get(seg_type, black)
+
+                # Wrap word by word; state is re-set per word because
+                # showPage resets the graphics state mid-segment.
+                for word in text.split():
+                    word_width = stringWidth(word, font, font_size)
+                    if x + word_width > max_x and x > margin:
+                        newline()
+                    c.setFont(font, font_size)
+                    c.setFillColor(color)
+                    c.drawString(x, y, word)
+                    if seg_type in struck:
+                        c.setStrokeColor(color)
+                        strike_y = y + font_size * 0.3
+                        c.line(x, strike_y, x + word_width, strike_y)
+                    x += word_width + stringWidth(" ", font, font_size)
+                    drew_any = True
+
+            # Paragraph break with a little spacing
+            newline(extra=6 if not is_heading else 12)
+
+        if not drew_any:
+            c.setFont("Helvetica", 11)
+            c.setFillColor(black)
+            c.drawString(margin, page_h - margin, "No differences found.")
+
+        c.save()
 
 
 def extract_paragraphs_from_pdf(pdf_path: str) -> List[ExtractedParagraph]:
@@ -259,17 +444,28 @@ class PdfDocumentAdapter:
 
     def __init__(self, pdf_path: str):
         self.pdf_path = pdf_path
+        # Parsed lazily: constructing the adapter is cheap, the PDF is only
+        # read when the engine first asks for paragraphs.
         self._paragraphs = None
-        self._load()
 
     def _load(self):
         with PdfParser(self.pdf_path) as parser:
             extracted = parser.extract_paragraphs()
             # Create paragraph-like objects
             self._paragraphs = [PdfParagraphAdapter(p) for p in extracted]
+        # Drop the intermediate list eagerly; on big documents also sweep
+        # any cycles from the parse so MuPDF's dict trees don't linger past
+        # the parse window.
+        count = len(extracted)
+        del extracted
+        if count > 1000:
+            import gc
+            gc.collect()
 
     @property
     def paragraphs(self):
+        if self._paragraphs is None:
+            self._load()
         return self._paragraphs
 
     @property
@@ -2,68 +2,209 @@
 Test script that demonstrates the document comparison logic.
 This is a Python implementation of the same algorithm used in the C# library.
 """
-import difflib
-import re
+import multiprocessing
+import zipfile
+from array import array
+from collections import namedtuple
+from lxml import etree
 from docx import Document
+from docx.styles import BabelFish
 from docx.shared import Pt, RGBColor
 from docx.oxml.ns import qn
 from docx.oxml import OxmlElement
 from docx.enum.text import WD_COLOR_INDEX
 import os
 
+try:
+    import numpy as _np
+except ImportError:
+    _np = None
+
+try:
+    from rapidfuzz.distance import Indel as _Indel
+except ImportError:
+    _Indel = None
+
+try:
+    from scipy import sparse as _sparse
+except ImportError:
+    _sparse = None
+
 class DiffType:
-    UNCHANGED = 'unchanged'
-    INSERTED = 'inserted'
-    DELETED = 'deleted'
+    # Plain ints: segment tags are compared in tight loops and integer
+    # equality is a single C compare
+    UNCHANGED = 0
+    INSERTED = 1
+    DELETED = 2
 
-class DiffSegment:
-    def __init__(self, text, diff_type):
-        self.text = text
-        self.type = diff_type
+# Segments are produced by the thousand on large documents; a namedtuple
+# has no per-instance __dict__ and indexes fields at C level. word_count
+# is carried over from the diff opcodes so callers never re-tokenize.
+DiffSegment = namedtuple('DiffSegment', ['text', 'type', 'word_count'])
 
 def tokenize_to_words(text):
     """Split text into words."""
-    return re.findall(r'\S+', text)
+    # str.split() yields exactly the same tokens as re.findall(r'\S+')
+    # and runs in C without the regex machinery
+    return text.split()
 
 def get_paragraph_text(para):
     """Get plain text from a paragraph."""
     return para.text.strip()
 
+def _merge_replace_runs(opcodes):
+    """Coalesce touching non-equal opcode runs into 'replace'.
+
+    Normalizes both edit-script producers to one protocol: myers_diff
+    emits delete before insert and Indel.opcodes the reverse, but a
+    merged replace region reads identically either way, so the segment
+    loop always renders deleted-then-inserted text.
+    """
+    merged = []
+    for op in opcodes:
+        if merged and merged[-1][0] != 'equal' and op[0] != 'equal':
+            _, i1, _i2, j1, _j2 = merged.pop()
+            merged.append(('replace', i1, op[2], j1, op[4]))
+        else:
+            merged.append(op)
+    return merged
+
+
+def myers_diff(a, b):
+    """Myers O(ND) shortest-edit-script diff over two sequences.
+
+    Returns (tag, i1, i2, j1, j2) opcodes in the same protocol as
+    difflib.SequenceMatcher.get_opcodes(), with adjacent delete/insert
+    runs coalesced into 'replace'. For typical document edits D (the
+    number of changed words) is small, so this runs in roughly linear
+    time instead of SequenceMatcher's quadratic worst case, and it has
+    no junk heuristic to trip over repetitive phrasing.
+    """
+    n, m = len(a), len(b)
+
+    # Forward pass: furthest-reaching x per diagonal k, snapshotted per
+    # edit distance d for the backtrack.
+    v = {1: 0}
+    trace = []
+    found_d = None
+    for d in range(n + m + 1):
+        trace.append(dict(v))
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and v[k - 1] < v[k + 1]):
+                x = v[k + 1]
+            else:
+                x = v[k - 1] + 1
+            y = x - k
+            while x < n and y < m and a[x] == b[y]:
+                x += 1
+                y += 1
+            v[k] = x
+            if x >= n and y >= m:
+                found_d = d
+                break
+        if found_d is not None:
+            break
+
+    # Backtrack through the snapshots, collecting elementary steps
+    # (reversed): 'e' consumes from both sides, 'd' from a, 'i' from b.
+    steps = []
+    x, y = n, m
+    for d in range(found_d, 0, -1):
+        v = trace[d]
+        k = x - y
+        if k == -d or (k != d and v[k - 1] < v[k + 1]):
+            prev_k = k + 1
+        else:
+            prev_k = k - 1
+        prev_x = v[prev_k]
+        prev_y = prev_x - prev_k
+
+        while x > prev_x and y > prev_y:
+            steps.append('e')
+            x -= 1
+            y -= 1
+        if x > prev_x:
+            steps.append('d')
+            x -= 1
+        else:
+            steps.append('i')
+            y -= 1
+    while x > 0:
+        steps.append('e')
+        x -= 1
+        y -= 1
+    steps.reverse()
+
+    # Group the steps into opcode runs
+    opcodes = []
+    i = j = idx = 0
+    total = len(steps)
+    while idx < total:
+        tag = steps[idx]
+        run_start = idx
+        while idx < total and steps[idx] == tag:
+            idx += 1
+        run = idx - run_start
+
+        if tag == 'e':
+            opcodes.append(('equal', i, i + run, j, j + run))
+            i += run
+            j += run
+        elif tag == 'd':
+            opcodes.append(('delete', i, i + run, j, j))
+            i += run
+        else:
+            opcodes.append(('insert', i, i, j, j + run))
+            j += run
+
+    return _merge_replace_runs(opcodes)
+
+
 def diff_paragraphs(original_text, modified_text):
     """Perform word-level diff between two paragraphs."""
     if not original_text and not modified_text:
         return []
 
     if not original_text:
-        return [DiffSegment(modified_text, DiffType.INSERTED)]
+        return [DiffSegment(modified_text, DiffType.INSERTED, len(modified_text.split()))]
 
     if not modified_text:
-        return [DiffSegment(original_text, DiffType.DELETED)]
+        return [DiffSegment(original_text, DiffType.DELETED, len(original_text.split()))]
 
     # Tokenize to words
     original_words = tokenize_to_words(original_text)
     modified_words = tokenize_to_words(modified_text)
 
-    # Use difflib for word-level diff
-    matcher = difflib.SequenceMatcher(None, original_words, modified_words)
+    # Word-level shortest edit script: rapidfuzz computes the same
+    # minimal Indel script in C when installed; myers_diff is the
+    # pure-Python equivalent.
+    if _Indel is not None:
+        # Indel emits the insert of a replaced region before the delete;
+        # merging restores the deleted-then-inserted rendering order
+        opcodes = _merge_replace_runs(
+            (op.tag, op.src_start, op.src_end, op.dest_start, op.dest_end)
+            for op in _Indel.opcodes(original_words, modified_words))
+    else:
+        opcodes = myers_diff(original_words, modified_words)
+
     segments = []
 
-    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+    for tag, i1, i2, j1, j2 in opcodes:
         if tag == 'equal':
             text = ' '.join(original_words[i1:i2])
-            segments.append(DiffSegment(text, DiffType.UNCHANGED))
+            segments.append(DiffSegment(text, DiffType.UNCHANGED, i2 - i1))
         elif tag == 'delete':
             text = ' '.join(original_words[i1:i2])
-            segments.append(DiffSegment(text, DiffType.DELETED))
+            segments.append(DiffSegment(text, DiffType.DELETED, i2 - i1))
         elif tag == 'insert':
             text = ' '.join(modified_words[j1:j2])
-            segments.append(DiffSegment(text, DiffType.INSERTED))
+            segments.append(DiffSegment(text, DiffType.INSERTED, j2 - j1))
         elif tag == 'replace':
             # Delete old, insert new
             del_text = ' '.join(original_words[i1:i2])
             ins_text = ' '.join(modified_words[j1:j2])
-            segments.append(DiffSegment(del_text, DiffType.DELETED))
-            segments.append(DiffSegment(ins_text, DiffType.INSERTED))
+            segments.append(DiffSegment(del_text, DiffType.DELETED, i2 - i1))
+            segments.append(DiffSegment(ins_text, DiffType.INSERTED, j2 - j1))
 
     return segments
 
@@ -74,8 +215,9 @@ def calculate_similarity(text1, text2):
     if not text1 or not text2:
         return 0.0
 
-    words1 = set(tokenize_to_words(text1.lower()))
-    words2 = set(tokenize_to_words(text2.lower()))
+    # Inline lower().split() — one C call each, no function trampoline
+    words1 = set(text1.lower().split())
+    words2 = set(text2.lower().split())
 
     if not words1 and not words2:
         return 1.0
@@ -87,22 +229,379 @@ def calculate_similarity(text1, text2):
 
     return intersection / union if union > 0 else 0.0
 
+if _np is not None:
+    # Bits set per byte value, for popcounts over packed membership vectors
+    _POPCOUNT8 = _np.array([bin(b).count("1") for b in range(256)], dtype=_np.uint16)
+
+
+def _similarity_matrix(orig_texts, mod_texts, orig_tokens, mod_tokens,
+                       orig_sizes, mod_sizes, vocab_size):
+    """Build the boolean paragraph-similarity matrix with bit-vectors.
+
+    Token sets arrive already encoded as ints 0..vocab_size-1, so the
+    ids serve directly as column indices. Each pair's Jaccard comes from
+    popcounts of byte-wise AND (or one sparse matmul) instead of
+    building Python set intersections m*n times. The result is exact —
+    same decisions as calculate_similarity >= 0.5 — with one vectorized
+    pass per original paragraph.
+    """
+    m, n = len(orig_texts), len(mod_texts)
+
+    if _sparse is not None:
+        # One sparse matmul gives every pairwise intersection cardinality:
+        # with token-incidence matrices O (m x V) and M (n x V),
+        # inter = O @ M.T, all inside SciPy's C kernels.
+        def incidence(token_sets):
+            indices = []
+            indptr = [0]
+            for token_set in token_sets:
+                indices.extend(token_set)
+                indptr.append(len(indices))
+            data = _np.ones(len(indices), dtype=_np.int32)
+            return _sparse.csr_matrix(
+                (data, indices, indptr),
+                shape=(len(token_sets), max(vocab_size, 1)))
+
+        inter = (incidence(orig_tokens) @ incidence(mod_tokens).T).toarray()
+        sizes_o = _np.array(orig_sizes, dtype=_np.int64)
+        sizes_m = _np.array(mod_sizes, dtype=_np.int64)
+        S = inter * 2 >= sizes_o[:, None] + sizes_m[None, :] - inter
+    else:
+        def pack(token_sets):
+            bits = _np.zeros((len(token_sets), max(vocab_size, 1)), dtype=_np.uint8)
+            for row, token_set in zip(bits, token_sets):
+                for token_id in token_set:
+                    row[token_id] = 1
+            return _np.packbits(bits, axis=1)
+
+        orig_bits = pack(orig_tokens)
+        mod_bits = pack(mod_tokens)
+        mod_sizes_arr = _np.array(mod_sizes, dtype=_np.int64)
+
+        S = _np.zeros((m, n), dtype=bool)
+        for i in range(m):
+            inter = _POPCOUNT8[orig_bits[i] & mod_bits].sum(axis=1, dtype=_np.int64)
+            union = orig_sizes[i] + mod_sizes_arr - inter
+            S[i] = inter * 2 >= union
+
+    # Identical texts always align, including empty ones the token path
+    # can't see
+    mod_index = {}
+    for j, text in enumerate(mod_texts):
+        mod_index.setdefault(text, []).append(j)
+    for i, text in enumerate(orig_texts):
+        for j in mod_index.get(text, ()):
+            S[i][j] = True
+
+    return S
+
+
 def align_paragraphs(original_paras, modified_paras):
     """Align paragraphs using LCS algorithm."""
-    m, n = len(original_paras), len(modified_paras)
+    return _align_texts([get_paragraph_text(p) for p in original_paras],
+                        [get_paragraph_text(p) for p in modified_paras])
+
+def _align_texts(orig_texts, mod_texts):
+    """LCS paragraph alignment over pre-extracted text lists."""
+    # Contracts carry runs of empty spacing paragraphs; they'd inflate
+    # the O(mn) DP quadratically and can be re-interleaved afterwards,
+    # so only the non-empty paragraphs go through the LCS.
+    orig_map = [i for i, t in enumerate(orig_texts) if t]
+    mod_map = [j for j, t in enumerate(mod_texts) if t]
+
+    core = _align_nonempty([orig_texts[i] for i in orig_map],
+                           [mod_texts[j] for j in mod_map])
+
+    if len(orig_map) == len(orig_texts) and len(mod_map) == len(mod_texts):
+        return core  # nothing was filtered; compacted indices are real ones
+
+    # Translate compacted indices back and pass the empties through:
+    # paired off as unchanged where both sides have one, otherwise as
+    # empty deletes/inserts, exactly as the full DP used to emit them.
+    alignments = []
+    oi = mj = 0
+
+    def flush(to_i, to_j):
+        nonlocal oi, mj
+        while oi < to_i or mj < to_j:
+            if oi < to_i and mj < to_j:
+                alignments.append((oi, mj, DiffType.UNCHANGED))
+                oi += 1
+                mj += 1
+            elif oi < to_i:
+                alignments.append((oi, -1, DiffType.DELETED))
+                oi += 1
+            else:
+                alignments.append((-1, mj, DiffType.INSERTED))
+                mj += 1
+
+    for core_i, core_j, alignment_type in core:
+        if alignment_type == DiffType.UNCHANGED:
+            i, j = orig_map[core_i], mod_map[core_j]
+            flush(i, j)
+            alignments.append((i, j, alignment_type))
+            oi, mj = i + 1, j + 1
+        elif alignment_type == DiffType.DELETED:
+            i = orig_map[core_i]
+            flush(i, mj)
+            alignments.append((i, -1, alignment_type))
+            oi = i + 1
+        else:
+            j = mod_map[core_j]
+            flush(oi, j)
+            alignments.append((-1, j, alignment_type))
+            mj = j + 1
+    flush(len(orig_texts), len(mod_texts))
 
-    # Build LCS table
-    lcs = [[0] * (n + 1) for _ in range(m + 1)]
+    return alignments
 
-    for i in range(1, m + 1):
-        for j in range(1, n + 1):
-            orig_text = get_paragraph_text(original_paras[i-1])
-            mod_text = get_paragraph_text(modified_paras[j-1])
+# Template for zero-filled C-int DP rows
+_ZERO_ROW = array('i', [0])
+
+# Above this many DP cells the full LCS table is dropped for Hirschberg's
+# O(m+n)-memory divide and conquer (same cutoff as document_compare)
+HIRSCHBERG_CELL_THRESHOLD = 1_000_000
+
+def _hirschberg_pairs(similar, m, n):
+    """Find the LCS matched (i, j) pairs with Hirschberg's algorithm.
+
+    Splits the original range in half, computes forward LCS lengths for
+    the top half and reverse lengths for the bottom against the modified
+    range, picks the split column maximizing their sum, then recurses.
+    Only two DP rows are ever alive, so memory is O(n) instead of the
+    full m*n table (and no similarity matrix is materialized at all).
+    """
+    pairs = []
+
+    def lcs_row(o_lo, o_hi, m_lo, m_hi, reverse=False):
+        width = m_hi - m_lo
+        prev = [0] * (width + 1)
+        curr = [0] * (width + 1)
+        rows = range(o_hi - 1, o_lo - 1, -1) if reverse else range(o_lo, o_hi)
+        for i in rows:
+            for k in range(1, width + 1):
+                j = m_hi - k if reverse else m_lo + k - 1
+                if similar(i, j):
+                    curr[k] = prev[k-1] + 1
+                else:
+                    curr[k] = max(prev[k], curr[k-1])
+            prev, curr = curr, prev
+        return prev
+
+    def recurse(o_lo, o_hi, m_lo, m_hi):
+        if o_hi - o_lo == 0 or m_hi - m_lo == 0:
+            return
+
+        if o_hi - o_lo == 1:
+            # Single original row: scan for the first match
+            for j in range(m_lo, m_hi):
+                if similar(o_lo, j):
+                    pairs.append((o_lo, j))
+                    return
+            return
+
+        mid = (o_lo + o_hi) // 2
+        fwd = lcs_row(o_lo, mid, m_lo, m_hi)
+        rev = lcs_row(mid, o_hi, m_lo, m_hi, reverse=True)
+
+        width = m_hi - m_lo
+        best_k = 0
+        best = -1
+        for k in range(width + 1):
+            total = fwd[k] + rev[width - k]
+            if total > best:
+                best = total
+                best_k = k
+
+        recurse(o_lo, mid, m_lo, m_lo + best_k)
+        recurse(mid, o_hi, m_lo + best_k, m_hi)
+
+    recurse(0, m, 0, n)
+    return pairs
+
+# Starting band half-width for the Ukkonen-style alignment attempt
+BAND_INITIAL_WIDTH = 32
+
+def _banded_try(similar, m, n, k):
+    """Run the LCS DP restricted to the band |i - j| <= k.
+
+    Cells outside the band are never evaluated — no similarity call, no
+    table entry — so the fill costs O((m+n)*k) instead of m*n. The
+    banded table can only underestimate the true LCS: if the result
+    implies an edit distance within the band (m + n - 2L <= k) then an
+    optimal path fit entirely inside it and the alignment is returned;
+    otherwise the band may have clipped a better path and None signals
+    the caller to widen it.
+    """
+    bounds = [(max(0, i - k), min(n, i + k)) for i in range(m + 1)]
+    rows = [array('i', _ZERO_ROW * (hi - lo + 1)) for lo, hi in bounds]
+
+    def val(i, j):
+        lo, hi = bounds[i]
+        if j < lo or j > hi:
+            return -1
+        return rows[i][j - lo]
 
-            if calculate_similarity(orig_text, mod_text) >= 0.5:
-                lcs[i][j] = lcs[i-1][j-1] + 1
+    for i in range(1, m + 1):
+        lo, hi = bounds[i]
+        row = rows[i]
+        prev = rows[i - 1]
+        plo, phi = bounds[i - 1]
+        for j in range(max(lo, 1), hi + 1):
+            if similar(i - 1, j - 1):
+                diag = prev[j - 1 - plo] if plo <= j - 1 <= phi else 0
+                best = diag + 1
             else:
-                lcs[i][j] = max(lcs[i-1][j], lcs[i][j-1])
+                up = prev[j - plo] if plo <= j <= phi else 0
+                left = row[j - 1 - lo] if j - 1 >= lo else 0
+                best = up if up >= left else left
+            row[j - lo] = best
+
+    length = val(m, n)
+    if m + n - 2 * length > k:
+        return None
+
+    # Same greedy backtrack as the full table, with out-of-band cells
+    # reading as -1 so the path never leaves the band
+    alignments = []
+    i, j = m, n
+    while i > 0 or j > 0:
+        if i > 0 and j > 0 and similar(i - 1, j - 1):
+            alignments.append((i - 1, j - 1, DiffType.UNCHANGED))
+            i -= 1
+            j -= 1
+            continue
+
+        if j > 0 and (i == 0 or val(i, j - 1) >= val(i - 1, j)):
+            alignments.append((-1, j - 1, DiffType.INSERTED))
+            j -= 1
+        else:
+            alignments.append((i - 1, -1, DiffType.DELETED))
+            i -= 1
+
+    alignments.reverse()
+    return alignments
+
+def _banded_align(similar, m, n):
+    """Ukkonen-style banded alignment attempt; None means fall back.
+
+    Redlined documents are usually near-identical, so the optimal LCS
+    path hugs the main diagonal. Start with a narrow band, and double
+    its width whenever the result saturates it — but only while the
+    banded work stays below the full m*n table, past which the regular
+    paths are the better deal anyway.
+    """
+    k = max(BAND_INITIAL_WIDTH, abs(m - n))
+    while (m + n) * k < m * n:
+        alignments = _banded_try(similar, m, n, k)
+        if alignments is not None:
+            return alignments
+        k *= 2
+    return None
+
+def _align_nonempty(orig_texts, mod_texts):
+    """Run the LCS DP; inputs are assumed free of empty texts."""
+    m, n = len(orig_texts), len(mod_texts)
+
+    # Precompute lowercase token sets once per paragraph — the DP below
+    # visits all m*n pairs — and encode every word as a small int from a
+    # vocabulary shared by both documents: the set intersections then
+    # hash and compare machine ints instead of re-hashing strings, and
+    # the ids double as column indices for the similarity matrix.
+    vocab = {}
+
+    def encode(words):
+        ids = set()
+        for word in words:
+            word_id = vocab.get(word)
+            if word_id is None:
+                word_id = vocab[word] = len(vocab)
+            ids.add(word_id)
+        return frozenset(ids)
+
+    orig_tokens = [encode(t.lower().split()) for t in orig_texts]
+    mod_tokens = [encode(t.lower().split()) for t in mod_texts]
+    orig_sizes = [len(s) for s in orig_tokens]
+    mod_sizes = [len(s) for s in mod_tokens]
+
+    def similar(i, j):
+        """Cached equivalent of calculate_similarity(...) >= 0.5."""
+        if orig_texts[i] == mod_texts[j]:
+            return True
+        size1 = orig_sizes[i]
+        size2 = mod_sizes[j]
+        if not size1 or not size2:
+            return False
+        # Jaccard is at most min/max of the set sizes, so heavily
+        # size-mismatched pairs can't reach 0.5: reject them from the
+        # precomputed cardinalities alone, before any set operation.
+        if size1 * 2 < size2 or size2 * 2 < size1:
+            return False
+        intersection = len(orig_tokens[i] & mod_tokens[j])
+        return intersection * 2 >= size1 + size2 - intersection
+
+    # Banded attempt first: when the documents align near the diagonal
+    # (the common redlining case) this settles the whole alignment in
+    # O((m+n)*k) similarity calls and bails out provably-safely when the
+    # band is too narrow.
+    if m and n:
+        banded = _banded_align(similar, m, n)
+        if banded is not None:
+            return banded
+
+    # Very large documents skip the materialized similarity matrix and
+    # LCS table entirely: Hirschberg finds the same matched pairs in
+    # O(m+n) memory, and the gaps expand to deletes/inserts directly.
+    if m * n > HIRSCHBERG_CELL_THRESHOLD:
+        alignments = []
+        i = j = 0
+        for pi, pj in _hirschberg_pairs(similar, m, n):
+            while i < pi:
+                alignments.append((i, -1, DiffType.DELETED))
+                i += 1
+            while j < pj:
+                alignments.append((-1, j, DiffType.INSERTED))
+                j += 1
+            alignments.append((pi, pj, DiffType.UNCHANGED))
+            i, j = pi + 1, pj + 1
+        while i < m:
+            alignments.append((i, -1, DiffType.DELETED))
+            i += 1
+        while j < n:
+            alignments.append((-1, j, DiffType.INSERTED))
+            j += 1
+        return alignments
+
+    # Pairwise similarity decisions, computed once and shared by the DP
+    # fill and the backtrack
+    if _np is not None and m and n:
+        S = _similarity_matrix(orig_texts, mod_texts, orig_tokens, mod_tokens,
+                               orig_sizes, mod_sizes, len(vocab))
+    else:
+        S = [[similar(i, j) for j in range(n)] for i in range(m)]
+
+    # Build LCS table
+    if _np is not None and m and n:
+        # Fill row by row with NumPy: when S holds the cell is
+        # prev[j-1] + 1, otherwise max(prev[j], row[j-1]); the running
+        # row[j-1] max folds into one maximum.accumulate because LCS rows
+        # are non-decreasing with steps of at most 1.
+        lcs = _np.zeros((m + 1, n + 1), dtype=_np.int32)
+        for i in range(1, m + 1):
+            prev = lcs[i-1]
+            matched = _np.where(S[i-1], prev[:-1] + 1, 0)
+            lcs[i][1:] = _np.maximum.accumulate(_np.maximum(matched, prev[1:]))
+    else:
+        # Rows of C ints: 4 bytes per cell and contiguous per row,
+        # instead of ~28-byte boxed Python ints behind pointer hops
+        lcs = [array('i', _ZERO_ROW * (n + 1)) for _ in range(m + 1)]
+
+        for i in range(1, m + 1):
+            for j in range(1, n + 1):
+                if S[i-1][j-1]:
+                    lcs[i][j] = lcs[i-1][j-1] + 1
+                else:
+                    lcs[i][j] = max(lcs[i-1][j], lcs[i][j-1])
 
     # Backtrack to find alignment
     alignments = []
@@ -110,9 +609,7 @@ def align_paragraphs(original_paras, modified_paras):
 
     while i > 0 or j > 0:
         if i > 0 and j > 0:
-            orig_text = get_paragraph_text(original_paras[i-1])
-            mod_text = get_paragraph_text(modified_paras[j-1])
-            if calculate_similarity(orig_text, mod_text) >= 0.5:
+            if S[i-1][j-1]:
                 alignments.append((i-1, j-1, DiffType.UNCHANGED))
                 i -= 1
                 j -= 1
@@ -137,20 +634,158 @@ def set_run_formatting(run, diff_type):
         run.bold = True
         run.font.color.rgb = RGBColor(0, 0, 255)  # Blue
 
-def create_redlined_document(original_path, modified_path, output_path):
-    """Create a redlined document showing differences."""
-    original_doc = Document(original_path)
-    modified_doc = Document(modified_path)
+# Below this many aligned pairs, process startup outweighs the parallel win
+PARALLEL_DIFF_MIN_PAIRS = 50
+
+def _diff_pair(pair):
+    """Top-level worker so the pool can pickle it."""
+    return diff_paragraphs(pair[0], pair[1])
+
+def _diff_pairs(pairs, workers=None):
+    """Word-diff aligned text pairs, fanning out to processes when it pays.
+
+    Each pair's diff is independent, so large documents split across a
+    multiprocessing.Pool; the docx assembly stays on the calling process
+    since lxml writes aren't parallel-safe.
+    """
+    if len(pairs) < PARALLEL_DIFF_MIN_PAIRS:
+        return [diff_paragraphs(orig_text, mod_text) for orig_text, mod_text in pairs]
+
+    with multiprocessing.Pool(workers or os.cpu_count()) as pool:
+        return list(pool.imap(_diff_pair, pairs, chunksize=32))
+
+# WordprocessingML namespace prefix, as in document_compare
+_W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+
+def _style_name_map(zf):
+    """Map style ids from styles.xml to their display names."""
+    try:
+        data = zf.read('word/styles.xml')
+    except KeyError:
+        return {}
+
+    names = {}
+    for style in etree.fromstring(data).iter(_W + 'style'):
+        style_id = style.get(_W + 'styleId')
+        name_el = style.find(_W + 'name')
+        if style_id and name_el is not None:
+            # styles.xml stores internal names ("heading 1"); translate
+            # to the UI names ("Heading 1") python-docx reports
+            names[style_id] = BabelFish.internal2ui(
+                name_el.get(_W + 'val', style_id))
+    return names
+
+def fast_paragraph_texts(path):
+    """Stream (text, style_name) per body paragraph from the raw docx XML.
+
+    The read side only needs each paragraph's stripped text and style
+    name, so etree.iterparse over word/document.xml yields them without
+    constructing python-docx paragraph/run wrappers; elements are
+    cleared as soon as they're consumed, so peak memory stays at one
+    paragraph. Table-nested paragraphs are skipped to match
+    doc.paragraphs.
+    """
+    results = []
+    with zipfile.ZipFile(path) as zf:
+        style_names = _style_name_map(zf)
+        with zf.open('word/document.xml') as stream:
+            for _event, p in etree.iterparse(stream, tag=_W + 'p'):
+                ancestor = p.getparent()
+                in_table = False
+                while ancestor is not None:
+                    if ancestor.tag == _W + 'tbl':
+                        in_table = True
+                        break
+                    ancestor = ancestor.getparent()
+
+                if not in_table:
+                    text = ''.join(t.text for t in p.iter(_W + 't') if t.text)
+                    style_id = None
+                    pPr = p.find(_W + 'pPr')
+                    if pPr is not None:
+                        pStyle = pPr.find(_W + 'pStyle')
+                        if pStyle is not None:
+                            style_id = pStyle.get(_W + 'val')
+                    results.append((text.strip(),
+                                    style_names.get(style_id, 'Normal')))
+
+                p.clear()
+    return results
+
+# Everything both output stages need: documents parsed once, texts and
+# style names extracted once, alignment computed once.
+ComparisonState = namedtuple(
+    'ComparisonState',
+    ['orig_texts', 'mod_texts', 'orig_style_names', 'mod_style_names',
+     'alignments'])
+
+def load_and_align(original_path, modified_path):
+    """Read both documents and compute the shared paragraph alignment.
+
+    The read side goes through fast_paragraph_texts, so python-docx is
+    only involved when create_redlined_document writes the output.
+    Callers that both print a summary and write a redline share one
+    ComparisonState instead of redoing the parse and the O(mn) DP per
+    stage.
+    """
+    orig = fast_paragraph_texts(original_path)
+    mod = fast_paragraph_texts(modified_path)
+
+    orig_texts = [text for text, _style in orig]
+    mod_texts = [text for text, _style in mod]
+    alignments = _align_texts(orig_texts, mod_texts)
+
+    return ComparisonState(orig_texts, mod_texts,
+                           [style for _text, style in orig],
+                           [style for _text, style in mod],
+                           alignments)
+
+def iter_diffed_paragraphs(state, workers=None):
+    """Stream (orig_idx, mod_idx, alignment_type, segments) per alignment.
+
+    Word-diffs every aligned pair exactly once (in parallel on big
+    documents); DELETED and INSERTED rows carry segments=None. Both
+    output stages consume this stream, so the per-pair diff work is
+    never repeated.
+    """
+    aligned_pairs = [(state.orig_texts[orig_idx], state.mod_texts[mod_idx])
+                     for orig_idx, mod_idx, alignment_type in state.alignments
+                     if alignment_type == DiffType.UNCHANGED]
+    aligned_diffs = iter(_diff_pairs(aligned_pairs, workers))
+
+    for orig_idx, mod_idx, alignment_type in state.alignments:
+        if alignment_type == DiffType.UNCHANGED:
+            yield orig_idx, mod_idx, alignment_type, next(aligned_diffs)
+        else:
+            yield orig_idx, mod_idx, alignment_type, None
+
+def create_redlined_document(state, output_path, workers=None, diffed=None):
+    """Create a redlined document showing differences.
+
+    Pass diffed (the output of iter_diffed_paragraphs) to reuse a diff
+    pass shared with another consumer; otherwise one is computed here.
+    """
+    orig_texts = state.orig_texts
+    mod_texts = state.mod_texts
+    orig_style_names = state.orig_style_names
+    mod_style_names = state.mod_style_names
+
+    if diffed is None:
+        diffed = iter_diffed_paragraphs(state, workers)
 
     # Create output document
     redlined_doc = Document()
 
-    # Get paragraphs (excluding empty ones for alignment purposes, but we'll handle them)
-    original_paras = list(original_doc.paragraphs)
-    modified_paras = list(modified_doc.paragraphs)
+    # Looking up a style wraps a new proxy object each time; reuse them
+    # across paragraphs
+    style_cache = {}
 
-    # Align paragraphs
-    alignments = align_paragraphs(original_paras, modified_paras)
+    def copy_heading_style(para, style_name):
+        if style_name.startswith('Heading'):
+            style = style_cache.get(style_name)
+            if style is None:
+                style = style_cache[style_name] = redlined_doc.styles[style_name]
+            para.style = style
 
     # Statistics
     stats = {
@@ -160,17 +795,15 @@ def create_redlined_document(original_path, modified_path, output_path):
     }
 
     # Generate redlined content
-    for orig_idx, mod_idx, alignment_type in alignments:
+    for orig_idx, mod_idx, alignment_type, segments in diffed:
         if alignment_type == DiffType.DELETED:
             # Entire paragraph deleted
             para = redlined_doc.add_paragraph()
-            orig_para = original_paras[orig_idx]
 
             # Copy style if it's a heading
-            if orig_para.style.name.startswith('Heading'):
-                para.style = redlined_doc.styles[orig_para.style.name]
+            copy_heading_style(para, orig_style_names[orig_idx])
 
-            text = get_paragraph_text(orig_para)
+            text = orig_texts[orig_idx]
             if text:
                 run = para.add_run(text)
                 set_run_formatting(run, DiffType.DELETED)
@@ -179,13 +812,11 @@ def create_redlined_document(original_path, modified_path, output_path):
         elif alignment_type == DiffType.INSERTED:
             # Entire paragraph inserted
             para = redlined_doc.add_paragraph()
-            mod_para = modified_paras[mod_idx]
 
             # Copy style if it's a heading
-            if mod_para.style.name.startswith('Heading'):
-                para.style = redlined_doc.styles[mod_para.style.name]
+            copy_heading_style(para, mod_style_names[mod_idx])
 
-            text = get_paragraph_text(mod_para)
+            text = mod_texts[mod_idx]
             if text:
                 run = para.add_run(text)
                 set_run_formatting(run, DiffType.INSERTED)
@@ -193,19 +824,10 @@ def create_redlined_document(original_path, modified_path, output_path):
 
         else:
             # Paragraph exists in both - do word-level diff
-            orig_para = original_paras[orig_idx]
-            mod_para = modified_paras[mod_idx]
-
             para = redlined_doc.add_paragraph()
 
             # Copy style if it's a heading
-            if mod_para.style.name.startswith('Heading'):
-                para.style = redlined_doc.styles[mod_para.style.name]
-
-            orig_text = get_paragraph_text(orig_para)
-            mod_text = get_paragraph_text(mod_para)
-
-            segments = diff_paragraphs(orig_text, mod_text)
+            copy_heading_style(para, mod_style_names[mod_idx])
 
             for i, segment in enumerate(segments):
                 if segment.text:
@@ -216,7 +838,7 @@ def create_redlined_document(original_path, modified_path, output_path):
                     run = para.add_run(segment.text)
                     set_run_formatting(run, segment.type)
 
-                    word_count = len(tokenize_to_words(segment.text))
+                    word_count = segment.word_count
                     if segment.type == DiffType.INSERTED:
                         stats['insertions'] += word_count
                     elif segment.type == DiffType.DELETED:
@@ -229,42 +851,40 @@ def create_redlined_document(original_path, modified_path, output_path):
 
     return stats
 
-def print_diff_summary(original_path, modified_path):
-    """Print a text-based diff summary."""
-    original_doc = Document(original_path)
-    modified_doc = Document(modified_path)
-
-    original_paras = list(original_doc.paragraphs)
-    modified_paras = list(modified_doc.paragraphs)
-
-    alignments = align_paragraphs(original_paras, modified_paras)
+def print_diff_summary(state, diffed=None):
+    """Print a text-based diff summary.
 
+    Pass diffed (the output of iter_diffed_paragraphs) to reuse a diff
+    pass shared with another consumer; otherwise one is computed here.
+    """
     print("\n" + "="*80)
     print("DOCUMENT COMPARISON SUMMARY")
     print("="*80)
 
+    if diffed is None:
+        diffed = iter_diffed_paragraphs(state)
+
     para_num = 0
-    for orig_idx, mod_idx, alignment_type in alignments:
+    for orig_idx, mod_idx, alignment_type, segments in diffed:
         para_num += 1
 
         if alignment_type == DiffType.DELETED:
-            text = get_paragraph_text(original_paras[orig_idx])
+            text = state.orig_texts[orig_idx]
             if text:
                 print(f"\n[DELETED] Paragraph {para_num}:")
                 print(f"  - {text[:100]}{'...' if len(text) > 100 else ''}")
 
         elif alignment_type == DiffType.INSERTED:
-            text = get_paragraph_text(modified_paras[mod_idx])
+            text = state.mod_texts[mod_idx]
             if text:
                 print(f"\n[INSERTED] Paragraph {para_num}:")
                 print(f"  + {text[:100]}{'...' if len(text) > 100 else ''}")
 
         else:
-            orig_text = get_paragraph_text(original_paras[orig_idx])
-            mod_text = get_paragraph_text(modified_paras[mod_idx])
+            orig_text = state.orig_texts[orig_idx]
+            mod_text = state.mod_texts[mod_idx]
 
             if orig_text != mod_text and (orig_text or mod_text):
-                segments = diff_paragraphs(orig_text, mod_text)
                 has_changes = any(s.type != DiffType.UNCHANGED for s in segments)
 
                 if has_changes:
@@ -288,15 +908,19 @@ if __name__ == '__main__':
     print(f"Modified: {modified_path}")
     print(f"Output:   {output_path}")
 
+    # Open, parse, align and word-diff once for both output stages
+    state = load_and_align(original_path, modified_path)
+    diffed = list(iter_diffed_paragraphs(state))
+
     # Print text-based diff summary
-    print_diff_summary(original_path, modified_path)
+    print_diff_summary(state, diffed)
 
     # Create redlined document
     print("\n" + "="*80)
     print("GENERATING REDLINED DOCUMENT")
     print("="*80)
 
-    stats = create_redlined_document(original_path, modified_path, output_path)
+    stats = create_redlined_document(state, output_path, diffed=diffed)
 
     print(f"\nRedlined document created: {output_path}")
     print(f"\nStatistics:")
@@ -40,6 +40,7 @@ setup(
         "pymupdf>=1.23.0",
         "reportlab>=4.0.0",
         "lxml>=4.9.0",
+        "rapidfuzz>=3.0.0",
     ],
     extras_require={
         "dev": [